@@ -4,50 +4,127 @@ main.py
 This script provides a GUI application to check the availability of classes at MSOE using Selenium for web automation.
 It includes functionalities to add, edit, and remove classes, set check intervals, and display the status of class availability checks.
 """
+import os
+import argparse
+import atexit
 import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 
 from plyer import notification
+import requests
+from lxml import html as lxml_html
 import time
-import datetime
+import logging
+import random
 import tkinter as tk
-from tkinter import ttk, messagebox
-from queue import Queue
+from tkinter import ttk, messagebox, font as tkfont
+from queue import Queue, Empty
 
 # Constants
-SECONDS_TO_WAIT = 5
+ELEMENT_TIMEOUT_SECONDS = 5
+NOTIFICATION_TIMEOUT_SECONDS = 1
+NOTIFICATION_DEBOUNCE_SECONDS = 0.2
+NOTIFICATION_MAX_CHARS = 250  # plyer's Windows backend rejects messages of 256 characters or more
 MINUTES_TO_SECONDS = 60
+HTTP_TIMEOUT_SECONDS = 5
+WAIT_POLL_SECONDS = 0.05
+MAX_BACKOFF_SECONDS = 300
+MIN_CHECK_GAP_SECONDS = 1
+STALE_RETRIES = 3
+STALE_RETRY_DELAY_SECONDS = 0.1
+STATUS_REFRESH_MS = 200
 
 # Global Variables
 SCHEDULER_URL = "https://resources.msoe.edu/sched/"
 TEXT_FIELD_CLASS_NAME = "form-control"
 CHECKBOX_CLASS = "fs-checkbox-element"
 SUBMIT_BUTTON_CLASS = "msoe-submit-button"
-PATH_TO_DRIVER = "chromedriver.exe"
+ERROR_CLASS = "flash-error"
+CHECKBOX_NAME_TEMPLATE = "courses[{}-{}][{}]"
+UNKNOWN_CLASS_MESSAGE = "is unknown or not offered for the selected semester"
+# ChromeDriver binary given with --driver-path; None lets Selenium Manager resolve a driver matching the installed Chrome
+PATH_TO_DRIVER = None
+CHROME_PROFILE_DIR = os.path.expanduser("~/.msoe-finder-chrome")
+# Resources and trackers the checks never need; the form and checkboxes only need the HTML and page scripts
+BLOCKED_URL_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.woff", "*.woff2", "*.ttf", "*.css",
+                        "*google-analytics.com*", "*googletagmanager.com*"]
+
+# Matches either a section checkbox or the error message, i.e. anything that shows the results have loaded
+RESULTS_LOCATOR = (By.CSS_SELECTOR, f".{CHECKBOX_CLASS}, .{ERROR_CLASS}")
+
+# Fills the wishlist field and clicks the submit button in a single WebDriver command
+ENTER_CLASSES_SCRIPT = """
+arguments[0].value = arguments[1];
+arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
+arguments[2].click();
+"""
+
+# Copies the live checked state of the elements matching arguments[0] into their attributes, then returns
+# only the markup of those elements (the error message and the tracked courses' checkboxes) rather than the whole page
+PAGE_SNAPSHOT_SCRIPT = """
+const elements = document.querySelectorAll(arguments[0]);
+elements.forEach(el => { if (el.type === 'checkbox') el.toggleAttribute('checked', el.checked); });
+return Array.from(elements, el => el.outerHTML).join('');
+"""
 
 # Create an Options object for Chrome
 options = Options()
 options.add_argument("--log-level=3")
-options.add_argument("--start-maximized")
+options.add_argument("--headless=new")
+options.add_argument("--disable-gpu")
+options.add_argument("--disable-dev-shm-usage")
+options.add_argument("--blink-settings=imagesEnabled=false")
+options.add_argument("--mute-audio")
+options.add_argument("--disable-extensions")
+options.add_argument("--disable-background-networking")
+options.add_argument("--disable-renderer-backgrounding")
+options.add_argument("--disable-background-timer-throttling")
+options.add_argument("--disable-ipc-flooding-protection")
+options.add_argument("--hide-scrollbars")
+options.add_argument("--disable-features=TranslateUI,BlinkGenPropertyTrees")
+# Keep the profile between runs so the HTTP cache and cookies survive restarts
+options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR}")
+options.add_argument("--disk-cache-size=104857600")
 options.add_experimental_option("excludeSwitches", ["enable-automation"])
 options.add_experimental_option('useAutomationExtension', False)
+options.add_experimental_option("prefs", {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+})
+# Return from navigation at DOMContentLoaded; the explicit waits below cover the elements we read
+options.page_load_strategy = "eager"
+
+# WebDriver object for Chrome and its explicit wait, created by get_driver the first time the browser fallback is needed
+driver = None
+driver_wait = None
+
+# Held while a check uses the browser, so the driver is not quit from under it
+driver_lock = threading.Lock()
 
-# Create a Service object for ChromeDriver, installing it automatically if necessary
-service = Service(PATH_TO_DRIVER)
+# Shared HTTP session so cookies and keep-alive connections persist between checks
+session = requests.Session()
 
-# Create a WebDriver object for Chrome, using the specified service and options
-driver = webdriver.Chrome(service=service, options=options)
+# Scheduler form found by the last HTTP check, reused until a submission with it is rejected
+scheduler_form = None
 
-driver.minimize_window()
+# Set to False once the scheduler form cannot be submitted without a browser, or its result disagrees with the browser's
+http_checks_enabled = True
+
+# Set to True once an HTTP result has matched the browser's on a checked checkbox, so later checks can skip the browser
+http_checks_verified = False
+
+# Logger for check results; the GUI attaches a handler that writes them to the status box
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
 
 # Create a queue for notifications
 notification_queue = Queue()
@@ -64,101 +141,412 @@ def pop_up_alert(message):
 def notification_worker():
     """
     Process notifications from the queue.
+
+    Messages that arrive within `NOTIFICATION_DEBOUNCE_SECONDS` of the first one are combined into a single
+    notification, with duplicates removed, so a burst of available classes creates one notification window
+    instead of one per class. Messages too long to show are cut to `NOTIFICATION_MAX_CHARS`.
     """
     while True:
-        message = notification_queue.get()
-        notification.notify(
-            title="Class Available!",
-            message=message,
-            timeout=1  # Set a very short timeout (1 second)
-        )
-        time.sleep(1.1)  # Wait slightly longer than the timeout before processing the next notification
-        notification_queue.task_done()
+        messages = [notification_queue.get()]
+        deadline = time.time() + NOTIFICATION_DEBOUNCE_SECONDS
+        while True:
+            try:
+                messages.append(notification_queue.get(timeout=max(0, deadline - time.time())))
+            except Empty:
+                break
+        unique_messages = list(dict.fromkeys(messages))
+        message = "\n".join(unique_messages)
+        if len(message) > NOTIFICATION_MAX_CHARS:
+            message = f"{len(unique_messages)} classes available:\n{message}"[:NOTIFICATION_MAX_CHARS - 3] + "..."
+        try:
+            notification.notify(
+                title="Class Available!",
+                message=message,
+                timeout=NOTIFICATION_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            # Keep the worker running so later alerts are still shown; the results are in the status box either way
+            logger.warning(f"Could not show notification: {e}")
+        time.sleep(NOTIFICATION_TIMEOUT_SECONDS + 0.1)  # Wait slightly longer than the timeout before processing the next notification
+        for _ in messages:
+            notification_queue.task_done()
+
+def get_driver():
+    """
+    Returns the shared Chrome WebDriver, starting it (and its reusable explicit wait) on first use.
 
-# Start the notification worker thread
-threading.Thread(target=notification_worker, daemon=True).start()
+    Callers must hold `driver_lock`, which makes the first-use check safe when an earlier checking run is still finishing.
+    """
+    global driver, driver_wait
+
+    if driver is None:
+        service = Service(PATH_TO_DRIVER) if PATH_TO_DRIVER else Service()
+        driver = webdriver.Chrome(service=service, options=options)
+        driver_wait = WebDriverWait(driver, ELEMENT_TIMEOUT_SECONDS, poll_frequency=WAIT_POLL_SECONDS,
+                                    ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+def quit_driver():
+    """
+    Quits the shared Chrome WebDriver, if it is running, so it holds no memory until the browser fallback is needed again.
+    """
+    global driver, driver_wait
 
-def enter_class(coursePrefix, courseCode, sectionNumber):
+    with driver_lock:
+        if driver is not None:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass  # Chrome has already gone away
+        driver = driver_wait = None
+
+atexit.register(quit_driver)
+
+def enter_classes(classes):
     """
-    Enters the class information into the scheduler webpage and submits the form.
+    Enters every class into the scheduler wishlist, one per line, and submits the form once.
+
+    The form is located again on every call, since each submit replaces the page. If the page re-renders between
+    locating the form and submitting it, the entry is retried, up to `STALE_RETRIES` attempts, instead of failing the whole check.
 
     Parameters:
-    - coursePrefix: The prefix of the course (e.g., "CPE").
-    - courseCode: The code of the course (e.g., "4610").
-    - sectionNumber: The section number of the course (e.g., "111").
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples (e.g., ("CPE", "4610", "111")).
+
+    Returns:
+    - The submitted wishlist field, which goes stale once the result page replaces the form.
+    """
+    wishlist = "\n".join(f"{coursePrefix} {courseCode} {sectionNumber}" for coursePrefix, courseCode, sectionNumber in classes)
+    for attempt in range(STALE_RETRIES):
+        if attempt:
+            time.sleep(STALE_RETRY_DELAY_SECONDS)  # The page is still re-rendering; give it a moment
+        try:
+            textField, submitButton = locate_form()
+            driver.execute_script(ENTER_CLASSES_SCRIPT, textField, wishlist, submitButton)
+            return textField
+        except StaleElementReferenceException:
+            pass
+    raise StaleElementReferenceException("Scheduler form kept changing while entering the classes")
+
+def locate_form():
     """
+    Locates the scheduler form on the current page, only navigating to the scheduler if the form is missing.
+
+    A result page without the form is left with the browser's back button first, which restores the scheduler
+    page from the browser cache; the scheduler is only loaded again if that page does not have the form either.
+
+    Returns:
+    - A (textField, submitButton) tuple of the form's wishlist field and submit button.
+    """
+    for navigate in (None, driver.back):
+        if navigate is not None:
+            navigate()
+        try:
+            return driver.find_element(By.CLASS_NAME, TEXT_FIELD_CLASS_NAME), driver.find_element(By.CLASS_NAME, SUBMIT_BUTTON_CLASS)
+        except NoSuchElementException:
+            pass
     driver.get(SCHEDULER_URL)
-    textField = driver.find_element(By.CLASS_NAME, TEXT_FIELD_CLASS_NAME)
-    textField.clear()
-    textField.send_keys(f"{coursePrefix} {courseCode} {sectionNumber} {Keys.ENTER}")
-    submitButton = driver.find_element(By.CLASS_NAME, SUBMIT_BUTTON_CLASS)
-    submitButton.send_keys(Keys.ENTER)
+    return driver.find_element(By.CLASS_NAME, TEXT_FIELD_CLASS_NAME), driver.find_element(By.CLASS_NAME, SUBMIT_BUTTON_CLASS)
 
-def check_class_availability(coursePrefix, courseCode, sectionNumber):
+def class_status(coursePrefix, courseCode, sectionNumber, unknown_courses, error_text, is_selected):
     """
-    Checks the availability of a class on the MSOE Scheduler page.
+    Builds the availability result for one class from the scraped result page.
 
     Parameters:
     - coursePrefix: The prefix of the course (e.g., "CPE").
     - courseCode: The code of the course (e.g., "4610").
     - sectionNumber: The section number of the course (e.g., "111").
+    - unknown_courses: The set of course tokens (e.g., "CPE-4610") listed as unknown or not offered.
+    - error_text: The text of the page's error message, or None if there is none.
+    - is_selected: Whether the section's checkbox is checked, or None if the checkbox is missing.
+
+    Returns:
+    - An (is_available, is_unknown, status_message) tuple, where is_unknown is True if the scheduler reported the course as unknown or not offered.
     """
-    try:
-        driver.get(SCHEDULER_URL)
-        enter_class(coursePrefix, courseCode, sectionNumber)
-        
-        # Wait for either the checkbox or an error message
-        try:
-            element = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, f".{CHECKBOX_CLASS}, .flash-error"))
-            )
-        except TimeoutException:
-            return False, f'Timeout: Class {coursePrefix} {courseCode} {sectionNumber} page did not load properly'
-        
-        # Check if an error message is present
-        error_message = driver.find_elements(By.CLASS_NAME, "flash-error")
-        if error_message:
-            error_text = error_message[0].text
-            if "unknown or not offered" in error_text:
-                unknown_courses = error_message[0].find_elements(By.TAG_NAME, "li")
-                for course in unknown_courses:
-                    if f"{coursePrefix}-{courseCode}" in course.text:
-                        return False, f'Class {coursePrefix} {courseCode} {sectionNumber} is unknown or not offered for the selected semester'
-            return False, f'Error for {coursePrefix} {courseCode} {sectionNumber}: {error_text}'
-        
-        # If no error, look for the checkbox
-        try:
-            checkbox = driver.find_element(By.CSS_SELECTOR, f'input[name="courses[{coursePrefix}-{courseCode}][{sectionNumber}]"]')
-        except NoSuchElementException:
-            return False, f'Could not find section number {sectionNumber} for class {coursePrefix} {courseCode} {sectionNumber}' 
-        
-        if checkbox.is_selected():
-            return True, f'Class {coursePrefix} {courseCode} {sectionNumber} IS available!'
+    # The error message covers the whole batch, so a checkbox on the page outranks it
+    if is_selected is not None:
+        if is_selected:
+            return True, False, f'Class {coursePrefix} {courseCode} {sectionNumber} IS available!'
         else:
-            return False, f'Class {coursePrefix} {courseCode} {sectionNumber} NOT available'
+            return False, False, f'Class {coursePrefix} {courseCode} {sectionNumber} NOT available'
+    if f"{coursePrefix}-{courseCode}" in unknown_courses:
+        return False, True, f'Class {coursePrefix} {courseCode} {sectionNumber} {UNKNOWN_CLASS_MESSAGE}'
+    if error_text:
+        return False, False, f'Error for {coursePrefix} {courseCode} {sectionNumber}: {error_text}'
+    return False, False, f'Could not find section number {sectionNumber} for class {coursePrefix} {courseCode} {sectionNumber}'
+
+def classes_error(classes, reason, error):
+    """
+    Builds the same failed result for every class in a batch.
+
+    Parameters:
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+    - reason: A short description of what went wrong (e.g., "Timeout occurred").
+    - error: The exception that caused the failure.
+    """
+    return [(False, False, f'{reason} for {coursePrefix} {courseCode} {sectionNumber}: {str(error)}') for coursePrefix, courseCode, sectionNumber in classes]
+
+def read_results_page(page, classes):
+    """
+    Reads the availability of each class from a parsed scheduler result page.
+
+    Parameters:
+    - page: The lxml document of the result page, or a fragment holding its error message and section checkboxes.
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+
+    Returns:
+    - A list of (is_available, is_unknown, status_message) tuples in the order of `classes`.
+    """
+    error_text = None
+    unknown_courses = set()
+    error_message = page.find_class(ERROR_CLASS)
+    if error_message:
+        error_text = " ".join(error_message[0].text_content().split())
+        if "unknown or not offered" in error_text:
+            # Keep whole course tokens so CPE-101 is not matched by an unknown CPE-1010
+            unknown_courses = {token.strip(",.;:()") for course in error_message[0].iter("li") for token in course.text_content().split()}
+
+    # Index the section checkboxes by name once so each class is a dictionary lookup
+    checkboxes = {checkbox.get("name"): checkbox for checkbox in page.xpath('//input[starts-with(@name, "courses[")]')}
+
+    results = []
+    for coursePrefix, courseCode, sectionNumber in classes:
+        checkbox = checkboxes.get(CHECKBOX_NAME_TEMPLATE.format(coursePrefix, courseCode, sectionNumber))
+        is_selected = None if checkbox is None else checkbox.get("checked") is not None
+        results.append(class_status(coursePrefix, courseCode, sectionNumber, unknown_courses, error_text, is_selected))
+    return results
+
+def is_results_page(page):
+    """
+    Returns whether a parsed page is a scheduler result page, i.e. it shows section checkboxes or an error message.
+
+    Parameters:
+    - page: The lxml document to inspect.
+    """
+    return bool(page.find_class(CHECKBOX_CLASS) or page.find_class(ERROR_CLASS))
+
+def load_scheduler_form():
+    """
+    Loads the scheduler page over HTTP and reads the form that holds the wishlist field.
+
+    The scheduler form (action, method, hidden/CSRF fields) is read from the live page rather than
+    hard-coded, so the request matches whatever the browser would have sent.
+
+    Returns:
+    - An (action, method, values, field_name) tuple, where values are the form's other fields as (name, value) pairs,
+      or None if the scheduler form could not be found.
+    """
+    response = session.get(SCHEDULER_URL, timeout=HTTP_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    page = lxml_html.fromstring(response.content, base_url=response.url)
+
+    text_fields = page.find_class(TEXT_FIELD_CLASS_NAME)
+    if not text_fields or text_fields[0].get("name") is None:
+        return None
+    text_field = text_fields[0]
+    form = next(text_field.iterancestors("form"), None)
+    if form is None:
+        return None
+
+    field_name = text_field.get("name")
+    values = [(name, value) for name, value in form.form_values() if name != field_name]
+    for button in form.find_class(SUBMIT_BUTTON_CLASS):
+        if button.get("name"):
+            values.append((button.get("name"), button.get("value", "")))
+    return form.action or response.url, form.method, values, field_name
+
+def submit_classes_http(classes):
+    """
+    Submits the classes to the scheduler over plain HTTP and returns the parsed result page.
+
+    The scheduler form is cached after the first check so later checks need a single request. If a submission
+    with the cached form is rejected or returns no section checkboxes, the form is loaded again and the submission retried once.
+
+    Parameters:
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+
+    Returns:
+    - The lxml document of the result page, or None if the scheduler form could not be found or the submission was rejected.
+    """
+    global scheduler_form
+
+    reused = scheduler_form is not None
+    if not reused:
+        scheduler_form = load_scheduler_form()
+        if scheduler_form is None:
+            return None
+
+    action, method, values, field_name = scheduler_form
+    wishlist = "\n".join(f"{coursePrefix} {courseCode} {sectionNumber}" for coursePrefix, courseCode, sectionNumber in classes)
+    values = values + [(field_name, wishlist)]
+    if method == "GET":
+        response = session.get(action, params=values, timeout=HTTP_TIMEOUT_SECONDS)
+    else:
+        response = session.post(action, data=values, timeout=HTTP_TIMEOUT_SECONDS)
+
+    page = lxml_html.fromstring(response.content) if response.ok and response.content else None
+    if reused and (page is None or not page.find_class(CHECKBOX_CLASS)):
+        # The cached form, e.g. its CSRF token, may have expired, which the scheduler can also report as an error message
+        scheduler_form = None
+        return submit_classes_http(classes)
+    if not response.ok:
+        return None  # The scheduler answered but refused the scripted submission (e.g. a 403 from a firewall)
+    return page
+
+def check_classes_availability_http(classes):
+    """
+    Checks the availability of the classes using a direct HTTP request instead of the browser.
+
+    Parameters:
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+
+    Returns:
+    - A list of (is_available, is_unknown, status_message) tuples in the order of `classes`, or None if the scheduler needs a browser to submit the form or render the result page.
+    """
+    global http_checks_enabled
+
+    page = submit_classes_http(classes)
+    if page is None or not is_results_page(page):
+        http_checks_enabled = False
+        return None
+
+    return read_results_page(page, classes)
+
+def reset_http_checks():
+    """
+    Allows HTTP checks again and requires their next result to be confirmed by the browser, so one bad response
+    (e.g. a maintenance page) only disables them until checking is started again.
+    """
+    global http_checks_enabled, http_checks_verified, scheduler_form
+
+    http_checks_enabled = True
+    http_checks_verified = False
+    scheduler_form = None
+
+def check_classes_availability(classes):
+    """
+    Checks the availability of the classes in a single scheduler submission, preferring a direct HTTP request and falling back to the browser.
+
+    HTTP results are compared with the browser's, since the raw page only has the checkboxes' initial state and
+    misses any state the page sets with script. HTTP checks are only used on their own once both agree on a checked
+    checkbox; until then the browser runs on every check, as results with nothing available cannot tell them apart.
+
+    Parameters:
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+
+    Returns:
+    - A (results, reached_scheduler) tuple, where results is a list of (is_available, is_unknown, status_message) tuples in the order of `classes`
+      and reached_scheduler is False if the check failed because of a network, timeout or browser error.
+    """
+    global http_checks_enabled, http_checks_verified
+
+    try:
+        http_results = check_classes_availability_http(classes) if http_checks_enabled else None
+        if http_results is not None and http_checks_verified:
+            return http_results, True
+        with driver_lock:
+            results = check_classes_availability_browser(classes)
+        if http_results is not None:
+            if [result[:2] for result in http_results] != [result[:2] for result in results]:
+                http_checks_enabled = False
+            elif any(is_available for is_available, _, _ in results):
+                http_checks_verified = True
+        return results, True
+    except requests.RequestException as e:
+        return classes_error(classes, 'Network error', e), False
     except NoSuchElementException as e:
-        return False, f'Element not found for {coursePrefix} {courseCode} {sectionNumber}: {str(e)}'
-    except TimeoutException as e:
-        return False, f'Timeout occurred for {coursePrefix} {courseCode} {sectionNumber}: {str(e)}'
+        return classes_error(classes, 'Element not found', e), False
+    except TimeoutException:
+        return [(False, False, f'Timeout: Class {coursePrefix} {courseCode} {sectionNumber} page did not load properly') for coursePrefix, courseCode, sectionNumber in classes], False
     except StaleElementReferenceException as e:
-        return False, f'Stale element for {coursePrefix} {courseCode} {sectionNumber}: {str(e)}'
+        return classes_error(classes, 'Stale element', e), False
     except WebDriverException as e:
-        return False, f'WebDriver error for {coursePrefix} {courseCode} {sectionNumber}: {str(e)}'
+        return classes_error(classes, 'WebDriver error', e), False
     except Exception as e:
-        return False, f'Unexpected error for {coursePrefix} {courseCode} {sectionNumber}: {str(e)}'
+        return classes_error(classes, 'Unexpected error', e), False
+
+def check_classes_availability_browser(classes):
+    """
+    Checks the availability of the classes on the MSOE Scheduler page using the browser.
+
+    Parameters:
+    - classes: A list of (coursePrefix, courseCode, sectionNumber) tuples.
+
+    Returns:
+    - A list of (is_available, is_unknown, status_message) tuples in the order of `classes`.
+    """
+    get_driver()
+    textField = enter_classes(classes)
+
+    # The form is usually submitted from the previous result page, which already has checkboxes,
+    # so wait for that page to be replaced before waiting for either the checkbox or an error message
+    driver_wait.until(EC.staleness_of(textField))
+    driver_wait.until(EC.presence_of_element_located(RESULTS_LOCATOR))
+
+    # Fetch the error message and every section of the tracked courses in one call and parse them locally
+    course_selectors = sorted({f'input[name^="courses[{coursePrefix}-{courseCode}]"]' for coursePrefix, courseCode, _ in classes})
+    snapshot_selector = ", ".join([f".{ERROR_CLASS}", *course_selectors])
+    page = lxml_html.fragment_fromstring(driver.execute_script(PAGE_SNAPSHOT_SCRIPT, snapshot_selector), create_parent="div")
+    return read_results_page(page, classes)
+
+class TextWidgetHandler(logging.Handler):
+    """
+    A logging handler that appends formatted records to a Tk text widget from any thread.
+
+    Tk widgets may only be used from the thread running the main loop, so records are queued by `emit`
+    and written to the widget by `drain`, which `ClassCheckerApp.process_events` runs on the main loop.
+    """
+    def __init__(self, widget):
+        """
+        Initialize the handler with the text widget to write to.
+
+        Parameters:
+        - widget: The tk.Text widget that displays the log lines.
+        """
+        super().__init__()
+        self.widget = widget
+        self.lines = Queue()
+        self.setFormatter(logging.Formatter("%(asctime)s: %(message)s", datefmt="%Y-%m-%d %I:%M:%S %p"))
+
+    def emit(self, record):
+        """
+        Queue a formatted log record for the text widget.
+
+        Parameters:
+        - record: The log record to display.
+        """
+        self.lines.put(self.format(record) + "\n")
+
+    def drain(self):
+        """
+        Append the queued lines to the end of the text widget in one insert and scroll to them.
+        """
+        lines = []
+        while True:
+            try:
+                lines.append(self.lines.get_nowait())
+            except Empty:
+                break
+        if lines:
+            self.widget.insert(tk.END, "".join(lines))
+            self.widget.see(tk.END)
+
 class ClassCheckerApp:
     """
     A class representing a Class Availability Checker application.
     Attributes:
     - master: The master window of the application.
-    - classes: A list of classes to check availability for.
+    - classes: A dict mapping each class list row id to the (prefix, number, section) tuple of the class to check.
     - check_interval: The interval (in seconds) between availability checks.
     - checking: A boolean indicating whether availability checks are currently running.
+    - unknown_classes: The class list row ids of classes the scheduler reported as unknown or not offered, which are skipped until reset.
+    - events: A queue of (callback, args) calls from the checking thread, run on the Tk main loop by `process_events`.
     Methods:
     - __init__(self, master): Initializes the ClassCheckerApp instance.
     - set_placeholder(self, entry, placeholder): Sets a placeholder text for an entry widget.
-    - clear_placeholder(self, event, placeholder): Clears the placeholder text when an entry widget is focused.
-    - restore_placeholder(self, event, placeholder): Restores the placeholder text when an entry widget loses focus.
+    - clear_placeholder(self, event): Clears the placeholder text when an entry widget is focused.
+    - restore_placeholder(self, event): Restores the placeholder text when an entry widget loses focus.
     - create_class_entry_frame(self): Creates and places the widgets for adding a class.
     - create_class_list_frame(self): Creates and places the widgets for displaying the class list.
     - create_interval_frame(self): Creates and places the widgets for setting the check interval.
@@ -167,9 +555,13 @@ class ClassCheckerApp:
     - clear_entry_fields(self): Clears the entry fields for adding a class.
     - edit_class(self): Opens a window for editing a selected class.
     - remove_class(self): Removes a selected class from the class list.
+    - process_events(self): Writes the queued status lines and runs the calls queued by the checking thread on the Tk main loop.
+    - mark_unknown_class(self, item): Strikes through a class the scheduler reported as unknown or not offered.
+    - reset_unknown_classes(self): Makes classes reported as unknown or not offered checkable again.
     - start_checking(self): Starts checking the availability of classes.
-    - check_schedule_availability(self): Checks the availability of classes at regular intervals.
+    - check_schedule_availability(self, pending, stop_event): Checks the availability of classes at regular intervals.
     - stop_checking(self): Stops checking the availability of classes.
+    - finish_checking(self, stop_event): Stops checking once no class is left to check.
     """
     def __init__(self, master):
         """
@@ -182,9 +574,12 @@ class ClassCheckerApp:
         master.title("Class Availability Checker")
         master.geometry("700x500")
 
-        self.classes = []
+        self.classes = {}
+        self.unknown_classes = set()
         self.check_interval = 60
         self.checking = False
+        self.stop_event = threading.Event()
+        self.events = Queue()
 
         # Create and place widgets
         self.create_class_entry_frame()
@@ -192,6 +587,8 @@ class ClassCheckerApp:
         self.create_interval_frame()
         self.create_status_frame()
 
+        self.master.after(STATUS_REFRESH_MS, self.process_events)
+
     def set_placeholder(self, entry, placeholder):
         """
         Set a placeholder text in an entry widget.
@@ -200,33 +597,32 @@ class ClassCheckerApp:
         - entry: The entry widget.
         - placeholder: The placeholder text.
         """
+        entry.placeholder = placeholder
         entry.insert(0, placeholder)
         entry.config(foreground='grey')
-        entry.bind("<FocusIn>", lambda event: self.clear_placeholder(event, placeholder))
-        entry.bind("<FocusOut>", lambda event: self.restore_placeholder(event, placeholder))
+        entry.bind("<FocusIn>", self.clear_placeholder)
+        entry.bind("<FocusOut>", self.restore_placeholder)
 
-    def clear_placeholder(self, event, placeholder):
+    def clear_placeholder(self, event):
         """
         Clear the placeholder text when the entry widget gains focus.
 
         Parameters:
-        - event: The focus event.
-        - placeholder: The placeholder text.
+        - event: The focus event; its widget holds the placeholder text set by `set_placeholder`.
         """
-        if event.widget.get() == placeholder:
+        if event.widget.get() == event.widget.placeholder:
             event.widget.delete(0, tk.END)
             event.widget.config(foreground='black')
 
-    def restore_placeholder(self, event, placeholder):
+    def restore_placeholder(self, event):
         """
         Restore the placeholder text when the entry widget loses focus.
 
         Parameters:
-        - event: The focus event.
-        - placeholder: The placeholder text.
+        - event: The focus event; its widget holds the placeholder text set by `set_placeholder`.
         """
         if not event.widget.get():
-            event.widget.insert(0, placeholder)
+            event.widget.insert(0, event.widget.placeholder)
             event.widget.config(foreground='grey')
 
     def create_class_entry_frame(self):
@@ -266,6 +662,9 @@ class ClassCheckerApp:
         self.class_tree.heading("Number", text="Number")
         self.class_tree.heading("Section", text="Section")
         self.class_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.unknown_font = tkfont.nametofont("TkDefaultFont").copy()
+        self.unknown_font.configure(overstrike=True)
+        self.class_tree.tag_configure("unknown", foreground="grey", font=self.unknown_font)
 
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.class_tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -277,6 +676,8 @@ class ClassCheckerApp:
         self.edit_button.pack(side=tk.LEFT, padx=5, pady=5)
         self.remove_button = ttk.Button(button_frame, text="Remove", command=self.remove_class)
         self.remove_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.reset_button = ttk.Button(button_frame, text="Reset Unknown", command=self.reset_unknown_classes)
+        self.reset_button.pack(side=tk.LEFT, padx=5, pady=5)
 
     def create_interval_frame(self):
         """
@@ -309,6 +710,9 @@ class ClassCheckerApp:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.status_text.configure(yscrollcommand=scrollbar.set)
 
+        self.status_handler = TextWidgetHandler(self.status_text)
+        logger.addHandler(self.status_handler)
+
     def add_class(self):
         """
         Add a class to the list of classes to be checked.
@@ -318,9 +722,8 @@ class ClassCheckerApp:
         section = self.section_entry.get().strip()
 
         if prefix and number and section:
-            class_info = f"{prefix} {number} {section}"
-            self.classes.append(class_info)
-            self.class_tree.insert("", tk.END, values=(prefix, number, section))
+            item = self.class_tree.insert("", tk.END, values=(prefix, number, section))
+            self.classes[item] = (prefix, number, section)
             self.clear_entry_fields()
         else:
             messagebox.showerror("Error", "Please fill in all fields.")
@@ -369,10 +772,9 @@ class ClassCheckerApp:
                 new_section = section_entry.get().strip()
 
                 if new_prefix and new_number and new_section:
-                    new_class_info = f"{new_prefix} {new_number} {new_section}"
-                    index = self.classes.index(f"{values[0]} {values[1]} {values[2]}")
-                    self.classes[index] = new_class_info
-                    self.class_tree.item(item, values=(new_prefix, new_number, new_section))
+                    self.classes[item] = (new_prefix, new_number, new_section)
+                    self.unknown_classes.discard(item)
+                    self.class_tree.item(item, values=(new_prefix, new_number, new_section), tags=())
                     edit_window.destroy()
                 else:
                     messagebox.showerror("Error", "Please fill in all fields.")
@@ -386,11 +788,43 @@ class ClassCheckerApp:
         selected_item = self.class_tree.selection()
         if selected_item:
             item = selected_item[0]
-            values = self.class_tree.item(item, "values")
-            class_info = f"{values[0]} {values[1]} {values[2]}"
-            self.classes.remove(class_info)
+            del self.classes[item]
+            self.unknown_classes.discard(item)
             self.class_tree.delete(item)
 
+    def process_events(self):
+        """
+        Write the queued status lines, run the calls queued by the checking thread and schedule the next drain, so widgets and shared state are only changed on the Tk main loop.
+        """
+        self.status_handler.drain()
+        while True:
+            try:
+                callback, args = self.events.get_nowait()
+            except Empty:
+                break
+            callback(*args)
+        self.master.after(STATUS_REFRESH_MS, self.process_events)
+
+    def mark_unknown_class(self, item):
+        """
+        Skip and strike through a class the scheduler reported as unknown or not offered.
+
+        Parameters:
+        - item: The class list row id of the class.
+        """
+        self.unknown_classes.add(item)
+        if self.class_tree.exists(item):
+            self.class_tree.item(item, tags=("unknown",))
+
+    def reset_unknown_classes(self):
+        """
+        Make the classes reported as unknown or not offered checkable again.
+        """
+        for item in self.unknown_classes:
+            if self.class_tree.exists(item):
+                self.class_tree.item(item, tags=())
+        self.unknown_classes.clear()
+
     def start_checking(self):
         """
         Start the process of checking class availability.
@@ -409,47 +843,69 @@ class ClassCheckerApp:
             messagebox.showerror("Error", "Please add at least one class to check.")
             return
 
+        if self.unknown_classes.issuperset(self.classes):
+            messagebox.showerror("Error", "Every class is unknown or not offered. Click \"Reset Unknown\" to check them again.")
+            return
+
         self.checking = True
+        reset_http_checks()
+        # A fresh event per run, so a worker that is still finishing a check after a stop cannot be revived by the next start
+        self.stop_event = threading.Event()
         self.disable_buttons()
-        threading.Thread(target=self.check_schedule_availability, daemon=True).start()
+        # Hand the worker its own copy of the classes to check, so it never reads state the Tk thread changes
+        pending = {item: self.classes[item] for item in self.classes if item not in self.unknown_classes}
+        threading.Thread(target=self.check_schedule_availability, args=(pending, self.stop_event), daemon=True).start()
 
-    def check_schedule_availability(self):
+    def check_schedule_availability(self, pending, stop_event):
         """
         Check the availability of classes in the schedule.
-        This method continuously checks the availability of classes in the schedule. It iterates over each class in the schedule and calls the `check_class_availability` function to determine if the class is available. The availability status and a status message are displayed in a text widget. If a class is available, a pop-up alert is shown.
-        The method uses a precise sleep method to ensure that the checking interval is maintained. It calculates the elapsed time for each iteration and determines the sleep time based on the desired check interval.
+        This method checks all pending classes together with the `check_classes_availability` function at every interval until no class is left to check, and logs a status message for each. A class that is available raises a pop-up alert, and a class that is available or unknown is no longer checked.
         Parameters:
-        - None
+        - pending: A dict mapping the class list row id of each class to check to its (prefix, number, section) tuple.
+        - stop_event: The threading.Event that is set when checking should stop.
         Returns:
         - None
         """
-        while self.checking:
+        delay = self.check_interval
+        while not stop_event.is_set():
             start_time = time.time()
-            
-            for class_info in self.classes:
-                coursePrefix, courseCode, sectionNumber = class_info.split()
-                is_available, status_message = check_class_availability(coursePrefix, courseCode, sectionNumber)
-                timestamp = datetime.datetime.now().strftime('%Y-%m-%d %I:%M:%S %p')
-                self.status_text.insert(tk.END, f"{timestamp}: {status_message}\n")
-                self.status_text.see(tk.END)
+
+            # All pending classes go in one submission, so each interval costs one page load
+            results, reached_scheduler = check_classes_availability(list(pending.values()))
+            if stop_event.is_set():
+                break  # Stopped during the check; a later run owns the class list and buttons now
+            for item, (is_available, is_unknown, status_message) in zip(list(pending), results):
+                logger.info(status_message)
                 if is_available:
                     pop_up_alert(status_message)
-            
-            elapsed_time = time.time() - start_time
-            sleep_time = max(0, self.check_interval - elapsed_time)
-            
-            # Use a more precise sleep method
-            end_time = start_time + self.check_interval
-            while time.time() < end_time:
-                remaining = end_time - time.time()
-                if remaining > 0:
-                    time.sleep(min(remaining, 0.1))  # Sleep in small increments
+                    del pending[item]
+                elif is_unknown:
+                    del pending[item]
+                    # Widgets and unknown_classes belong to the Tk thread, so changes to them are queued for process_events
+                    self.events.put((self.mark_unknown_class, (item,)))
+
+            if not pending:
+                self.events.put((self.finish_checking, (stop_event,)))
+                break
+
+            # Back off with jitter, up to MAX_BACKOFF_SECONDS, while the scheduler is failing and return to the normal interval once it answers
+            if reached_scheduler:
+                delay = self.check_interval
+            else:
+                delay = max(self.check_interval, min(delay * 2 + random.uniform(0, 1), MAX_BACKOFF_SECONDS))
+
+            # Waiting on the event lets Stop end the wait at once; the check's own duration counts toward the interval,
+            # but a short gap is left even when a check took longer than the interval, so checks never run back to back
+            stop_event.wait(timeout=max(MIN_CHECK_GAP_SECONDS, start_time + delay - time.time()))
+
+        # Release the browser while the app sits idle; it is started again on the next fallback check
+        quit_driver()
 
     def stop_checking(self):
         """
         Stops the checking process.
 
-        This method sets the 'checking' attribute to False, enabling the buttons and displaying an information message.
+        This method sets the 'checking' attribute to False and wakes the checking thread through its stop event, enabling the buttons and displaying an information message.
 
         Parameters:
             self (object): The instance of the class.
@@ -458,9 +914,23 @@ class ClassCheckerApp:
             None
         """
         self.checking = False
+        self.stop_event.set()
         self.enable_buttons()
         messagebox.showinfo("Info", "Checking has been stopped.")
 
+    def finish_checking(self, stop_event):
+        """
+        Ends the checking process once every class has been found available or reported as not offered.
+
+        Parameters:
+        - stop_event: The stop event of the run that has finished; nothing is done if that run was already stopped or replaced.
+        """
+        if stop_event is not self.stop_event or not self.checking:
+            return
+        self.checking = False
+        self.enable_buttons()
+        messagebox.showinfo("Info", "No classes are left to check. Checking has been stopped.")
+
     def disable_buttons(self):
         """
         Disables all buttons and entry fields in the GUI.
@@ -468,6 +938,7 @@ class ClassCheckerApp:
         self.add_button.config(state="disabled")
         self.edit_button.config(state="disabled")
         self.remove_button.config(state="disabled")
+        self.reset_button.config(state="disabled")
         self.start_button.config(state="disabled")
         self.interval_entry.config(state="disabled")
         self.prefix_entry.config(state="disabled")
@@ -490,6 +961,7 @@ class ClassCheckerApp:
         self.add_button.config(state="normal")
         self.edit_button.config(state="normal")
         self.remove_button.config(state="normal")
+        self.reset_button.config(state="normal")
         self.start_button.config(state="normal")
         self.interval_entry.config(state="normal")
         self.prefix_entry.config(state="normal")
@@ -497,12 +969,21 @@ class ClassCheckerApp:
         self.section_entry.config(state="normal")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the availability of classes at MSOE.")
+    parser.add_argument("--element-timeout", type=float, default=ELEMENT_TIMEOUT_SECONDS,
+                        help="seconds to wait for the scheduler results in the browser (default: %(default)s)")
+    parser.add_argument("--popup-linger", type=float, default=NOTIFICATION_TIMEOUT_SECONDS,
+                        help="seconds each availability notification stays on screen (default: %(default)s)")
+    parser.add_argument("--driver-path",
+                        help="ChromeDriver binary to use instead of the one Selenium Manager resolves for the installed Chrome")
+    args = parser.parse_args()
+    ELEMENT_TIMEOUT_SECONDS = args.element_timeout
+    NOTIFICATION_TIMEOUT_SECONDS = args.popup_linger
+    PATH_TO_DRIVER = args.driver_path
+
+    # Start the notification worker thread
+    threading.Thread(target=notification_worker, daemon=True).start()
+
     root = tk.Tk()
     app = ClassCheckerApp(root)
     root.mainloop()
-
-    try:
-        driver.close()
-        driver.quit()
-    except Exception as e:
-        print(f"Error closing the driver: {e}")
\ No newline at end of file